@@ -0,0 +1,85 @@
+"""Add geography columns
+
+Revision ID: b41c6f8d2a17
+Revises: 8ea185940dbd
+Create Date: 2026-08-28 09:14:36.102945
+
+"""
+
+from typing import Sequence, Union
+
+import geoalchemy2
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b41c6f8d2a17"
+down_revision: Union[str, None] = "8ea185940dbd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases populated by the pre-COPY loader stored city points as
+    # POINT(lat lon); the geography cast below rejects latitudes beyond
+    # +/-90, so flip those rows back to (lon lat) first. The old loader
+    # wrote the whole table in the flipped order, so a single
+    # out-of-range latitude means every row needs flipping.
+    op.execute(
+        """
+        UPDATE city
+        SET geo_location = ST_FlipCoordinates(geo_location)
+        WHERE EXISTS (
+            SELECT 1 FROM city WHERE abs(ST_Y(geo_location)) > 90
+        )
+        """
+    )
+    op.add_column(
+        "city",
+        sa.Column(
+            "geo_location_geog",
+            geoalchemy2.types.Geography(
+                geometry_type="POINT",
+                srid=4326,
+                from_text="ST_GeogFromText",
+                name="geography",
+            ),
+            sa.Computed("geo_location::geography", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "dmas",
+        sa.Column(
+            "geom_geog",
+            geoalchemy2.types.Geography(
+                srid=4326, from_text="ST_GeogFromText", name="geography"
+            ),
+            sa.Computed("geom::geography", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "idx_city_geo_location_geog",
+        "city",
+        ["geo_location_geog"],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "idx_dmas_geom_geog",
+        "dmas",
+        ["geom_geog"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_dmas_geom_geog", table_name="dmas", postgresql_using="gist")
+    op.drop_index(
+        "idx_city_geo_location_geog", table_name="city", postgresql_using="gist"
+    )
+    op.drop_column("dmas", "geom_geog")
+    op.drop_column("city", "geo_location_geog")
@@ -0,0 +1,59 @@
+"""Add gist indexes
+
+Revision ID: c7d91e30f5a8
+Revises: b41c6f8d2a17
+Create Date: 2026-08-28 09:41:12.518264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d91e30f5a8"
+down_revision: Union[str, None] = "b41c6f8d2a17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; the partial
+    # predicate skips the NULL geometries the loaders allow
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_dmas_geom",
+            "dmas",
+            ["geom"],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("geom IS NOT NULL"),
+        )
+        op.create_index(
+            "idx_pipes_geom",
+            "pipes",
+            ["geom"],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+            postgresql_where=sa.text("geom IS NOT NULL"),
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_pipes_geom",
+            table_name="pipes",
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "idx_dmas_geom",
+            table_name="dmas",
+            postgresql_using="gist",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,43 @@
+"""Add projected dma geoms
+
+Revision ID: f2a85c1d94e6
+Revises: c7d91e30f5a8
+Create Date: 2026-08-28 10:27:48.331209
+
+"""
+
+from typing import Sequence, Union
+
+import geoalchemy2
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a85c1d94e6"
+down_revision: Union[str, None] = "c7d91e30f5a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# EPSG codes the /dmas/total_area endpoint serves
+PROJECTED_SRIDS = (3035, 5070, 24376)
+
+
+def upgrade() -> None:
+    for srid in PROJECTED_SRIDS:
+        op.add_column(
+            "dmas",
+            sa.Column(
+                f"geom_{srid}",
+                geoalchemy2.types.Geometry(
+                    srid=srid, from_text="ST_GeomFromEWKT", name="geometry"
+                ),
+                sa.Computed(f"ST_Transform(geom, {srid})", persisted=True),
+                nullable=True,
+            ),
+        )
+
+
+def downgrade() -> None:
+    for srid in reversed(PROJECTED_SRIDS):
+        op.drop_column("dmas", f"geom_{srid}")
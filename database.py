@@ -8,7 +8,14 @@ DATABASE_URL = (
 )
 
 
-engine = create_async_engine(DATABASE_URL)
+# A shared compiled cache lets Core constructs reuse their compiled SQL
+# across requests; insertmanyvalues_page_size keeps any bulk INSERT path
+# batched into large multi-row VALUES statements
+engine = create_async_engine(
+    DATABASE_URL,
+    execution_options={"compiled_cache": {}},
+    insertmanyvalues_page_size=10_000,
+)
 
 async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
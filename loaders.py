@@ -0,0 +1,290 @@
+"""
+One-shot CSV loaders for the city, dmas and pipes tables.
+
+Run with: python loaders.py [cities|dmas|pipes]
+
+The loaders used to be HTTP endpoints, but a multi-minute bulk load held the
+async DB session open and competed with regular API traffic on the worker, so
+they live in a standalone CLI now. They keep the asyncpg COPY + pyarrow
+streaming path.
+"""
+
+import asyncio
+
+import numpy as np
+import pyarrow as pa
+import shapely
+import typer
+from pyarrow import csv as pyarrow_csv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import async_session_maker
+from services import is_city_table_empty, is_dma_table_empty, is_pipes_table_empty
+
+cli = typer.Typer(help="Load the CSV exports into the database.")
+
+# Geometry type codes returned by shapely.get_type_id
+DMA_GEOM_TYPE_IDS = (3, 6)  # Polygon, MultiPolygon
+PIPE_GEOM_TYPE_IDS = (1, 5)  # LineString, MultiLineString
+
+
+def validate_batch_geometries(batch, allowed_type_ids):
+    """
+    Validate and serialize the WKT geometry column of a record batch in bulk.
+
+    Parses the whole column with shapely's vectorized ufuncs instead of one
+    GEOS roundtrip per row.
+
+    Returns:
+    - geoms: the parsed shapely geometries (None where the field was empty)
+    - ewkb: EWKB bytes with SRID 4326 baked in (None where empty)
+    - valid: boolean mask, True where the geometry type is allowed or missing
+    """
+    wkts = np.array(batch.column("geom").to_pylist(), dtype=object)
+    geoms = shapely.from_wkt(wkts)
+    type_ids = shapely.get_type_id(geoms)
+    valid = np.isin(type_ids, allowed_type_ids) | (type_ids == -1)
+    ewkb = shapely.to_wkb(shapely.set_srid(geoms, 4326), include_srid=True)
+    return geoms, ewkb, valid
+
+
+async def iter_csv_batches(*args, **kwargs):
+    """
+    Stream record batches from a CSV without blocking the event loop.
+
+    pyarrow's open/read calls are blocking; running them on the default
+    thread pool keeps the loop free while gigabytes stream off disk.
+    """
+    reader = await asyncio.to_thread(pyarrow_csv.open_csv, *args, **kwargs)
+
+    def read_next_batch():
+        # The reader signals EOF with StopIteration, which asyncio refuses
+        # to set on a Future -- raised through to_thread it would leave the
+        # await hanging forever -- so translate it to a sentinel while still
+        # on the worker thread.
+        try:
+            return reader.read_next_batch()
+        except StopIteration:
+            return None
+
+    while (batch := await asyncio.to_thread(read_next_batch)) is not None:
+        yield batch
+
+
+async def get_raw_asyncpg_connection(db_session: AsyncSession):
+    """
+    Get the underlying asyncpg connection of the session, to run COPY directly.
+    The COPY happens inside the session transaction, so a regular
+    db_session.commit() still applies.
+
+    asyncpg only knows PostGIS geometry through its text fallback codec, which
+    its binary COPY path refuses, so a binary passthrough codec is registered
+    here; the loaders then hand geometry columns raw EWKB bytes.
+    """
+    connection = await db_session.connection()
+    raw_connection = await connection.get_raw_connection()
+    asyncpg_connection = raw_connection._connection
+    await asyncpg_connection.set_type_codec(
+        "geometry",
+        encoder=lambda value: value,
+        decoder=lambda value: value,
+        format="binary",
+    )
+    return asyncpg_connection
+
+
+async def load_cities(db_session: AsyncSession):
+    if not await is_city_table_empty(db_session):
+        return "Data is already loaded"
+
+    async def city_records():
+        batches = iter_csv_batches(
+            "us_cities.csv",
+            read_options=pyarrow_csv.ReadOptions(block_size=64 << 20),
+            convert_options=pyarrow_csv.ConvertOptions(
+                column_types={
+                    "LATITUDE": pa.float64(),
+                    "LONGITUDE": pa.float64(),
+                }
+            ),
+        )
+        async for batch in batches:
+            # Build the points in one vectorized call and serialize them
+            # as EWKB, so PostGIS skips the WKT parse on COPY
+            points = shapely.points(
+                batch.column("LONGITUDE").to_numpy(),
+                batch.column("LATITUDE").to_numpy(),
+            )
+            ewkb = shapely.to_wkb(shapely.set_srid(points, 4326), include_srid=True)
+            for i, row in enumerate(batch.to_pylist()):
+                yield (
+                    row["STATE_CODE"],
+                    row["STATE_NAME"],
+                    row["CITY"],
+                    row["COUNTY"],
+                    ewkb[i],
+                )
+
+    # COPY streams rows straight to Postgres, bypassing the ORM unit-of-work
+    asyncpg_connection = await get_raw_asyncpg_connection(db_session)
+    await asyncpg_connection.copy_records_to_table(
+        "city",
+        records=city_records(),
+        columns=["state_code", "state_name", "city", "county", "geo_location"],
+    )
+    await db_session.commit()
+    return "Data loaded successfully"
+
+
+async def load_dmas(db_session: AsyncSession):
+    if not await is_dma_table_empty(db_session):
+        return "Data is already loaded"
+
+    async def dma_records():
+        # pyarrow parses the CSV in C and yields columnar batches,
+        # keeping only batch-sized chunks in memory
+        batches = iter_csv_batches(
+            "output.csv",
+            read_options=pyarrow_csv.ReadOptions(block_size=64 << 20),
+            parse_options=pyarrow_csv.ParseOptions(delimiter=";"),
+            convert_options=pyarrow_csv.ConvertOptions(
+                # Empty geom fields must come through as null, not "", so
+                # rows keep their NULL geometry instead of failing from_wkt
+                strings_can_be_null=True,
+                column_types={
+                    "max_bug_coverage": pa.float64(),
+                    "start_date": pa.date32(),
+                    "end_date": pa.date32(),
+                }
+            ),
+        )
+        async for batch in batches:
+            geoms, ewkb, valid = validate_batch_geometries(batch, DMA_GEOM_TYPE_IDS)
+            for i, row in enumerate(batch.to_pylist()):
+                if not valid[i]:
+                    # Handle the case of unsupported geometry type
+                    print(
+                        f"Unsupported geometry type for DMA {row['dma_name']}: {geoms[i].geom_type}"
+                    )
+                    continue  # Skip this row due to invalid geometry type
+
+                yield (
+                    row["dma_key"],
+                    row["dma_name"],
+                    row["dma_long"],
+                    row["region"],
+                    row["zone"],
+                    ewkb[i],
+                    row["max_bug_coverage"],
+                    row["start_date"],
+                    row["end_date"],
+                )
+
+    asyncpg_connection = await get_raw_asyncpg_connection(db_session)
+    await asyncpg_connection.copy_records_to_table(
+        "dmas",
+        records=dma_records(),
+        columns=[
+            "dma_key",
+            "dma_name",
+            "dma_long",
+            "region",
+            "zone",
+            "geom",
+            "max_bug_coverage",
+            "start_date",
+            "end_date",
+        ],
+    )
+    await db_session.commit()
+    return "Data loaded successfully"
+
+
+async def load_pipes(db_session: AsyncSession):
+    if not await is_pipes_table_empty(db_session):
+        return "Data is already loaded"
+
+    async def pipe_records():
+        batches = iter_csv_batches(
+            "output_pipes.csv",
+            read_options=pyarrow_csv.ReadOptions(block_size=64 << 20),
+            parse_options=pyarrow_csv.ParseOptions(delimiter=";"),
+            convert_options=pyarrow_csv.ConvertOptions(
+                strings_can_be_null=True,
+                column_types={
+                    "diameter_mm": pa.float64(),
+                    "dma_id": pa.int64(),
+                    "company_id": pa.int64(),
+                    "created_date": pa.timestamp("s"),
+                }
+            ),
+        )
+        async for batch in batches:
+            geoms, ewkb, valid = validate_batch_geometries(batch, PIPE_GEOM_TYPE_IDS)
+            for i, row in enumerate(batch.to_pylist()):
+                if not valid[i]:
+                    # Handle the case of unsupported geometry type
+                    print(
+                        f"Unsupported geometry type for Pipe {row['pipe_key']}: {geoms[i].geom_type}"
+                    )
+                    continue  # Skip this row due to invalid geometry type
+
+                yield (
+                    ewkb[i],
+                    row["material"],
+                    row["pipe_key"],
+                    row["created_date"].date() if row["created_date"] else None,
+                    row["diameter_mm"],
+                    row["pipe_type"],
+                    row["pipe_subtype"],
+                    row["standardised_material"],
+                    row["dma_id"],
+                    row["company_id"],
+                )
+
+    asyncpg_connection = await get_raw_asyncpg_connection(db_session)
+    await asyncpg_connection.copy_records_to_table(
+        "pipes",
+        records=pipe_records(),
+        columns=[
+            "geom",
+            "material",
+            "pipe_key",
+            "created_date",
+            "diameter_mm",
+            "pipe_type",
+            "pipe_subtype",
+            "standardised_material",
+            "dma_id",
+            "company_id",
+        ],
+    )
+    await db_session.commit()
+    return "Data loaded successfully"
+
+
+async def _run(loader):
+    async with async_session_maker() as db_session:
+        return await loader(db_session)
+
+
+@cli.command()
+def cities():
+    """Load us_cities.csv into the city table."""
+    typer.echo(asyncio.run(_run(load_cities)))
+
+
+@cli.command()
+def dmas():
+    """Load output.csv into the dmas table."""
+    typer.echo(asyncio.run(_run(load_dmas)))
+
+
+@cli.command()
+def pipes():
+    """Load output_pipes.csv into the pipes table."""
+    typer.echo(asyncio.run(_run(load_pipes)))
+
+
+if __name__ == "__main__":
+    cli()
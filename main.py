@@ -1,181 +1,118 @@
-import csv
-from datetime import date, datetime
+from datetime import date
 
+import shapely
+from cachetools import TTLCache
 from fastapi import Depends, FastAPI, HTTPException, Path, Query, status
+from fastapi.responses import ORJSONResponse
 from geoalchemy2.functions import (
     ST_Area,
+    ST_AsText,
     ST_Distance,
     ST_DWithin,
     ST_GeogFromText,
     ST_GeogFromWKB,
-    ST_GeomFromText,
+    ST_GeomFromEWKB,
     ST_Intersects,
     ST_MakePoint,
     ST_SetSRID,
-    ST_Transform,
 )
-from shapely.wkt import loads
-from sqlalchemy import and_, select
+from shapely.errors import GEOSException
+from sqlalchemy import and_, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Optional
 
 from database import get_async_session
-from models import City, Dma, Pipe
+from models import City, Dma
 from schemas import (
+    CITY_LIST_ADAPTER,
+    DMA_LIST_ADAPTER,
     CitySchema,
     DmaSchema,
     NearbyCitiesByCoordsSchema,
     NearbyCitiesSchema,
 )
-from services import is_city_table_empty, is_dma_table_empty, is_pipes_table_empty
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 
-@app.get("/")
-async def root():
-    return {"message": "Hello World"}
-
-
-@app.get("/load-cities")
-async def load_cities(db_session: AsyncSession = Depends(get_async_session)):
-    if await is_city_table_empty(db_session):
-        cities = []
-        with open("us_cities.csv", "r") as csv_file:
-            csv_reader = csv.reader(csv_file, delimiter=",")
+def adapter_response(adapter, rows):
+    """
+    Serialize a list response through a shared TypeAdapter.
 
-            # Skip the first row (header)
-            next(csv_reader)
+    Validating and dumping the whole list in one pydantic-core call, then
+    returning a Response directly, bypasses FastAPI's per-item response
+    validation and jsonable_encoder pass.
+    """
+    return ORJSONResponse(
+        adapter.dump_python(adapter.validate_python(rows), mode="json")
+    )
 
-            for row in csv_reader:
-                city = City(
-                    state_code=row[1],
-                    state_name=row[2],
-                    city=row[3],
-                    county=row[4],
-                    geo_location=f"POINT({row[5]} {row[6]})",
-                )
-                cities.append(city)
 
-            db_session.add_all(cities)
-            await db_session.commit()
-            return {"message": "Data loaded successfully"}
+# Columns the response schemas need; selecting them directly returns plain
+# Core rows instead of hydrating ORM instances that are thrown away after
+# serialization
+DMA_COLUMNS = (
+    Dma.dma_id,
+    Dma.dma_key,
+    Dma.dma_name,
+    Dma.dma_long,
+    Dma.region,
+    Dma.zone,
+    # PostGIS formats the WKT in C, so rows reach Pydantic as plain strings
+    ST_AsText(Dma.geom).label("geom"),
+    Dma.start_date,
+)
+CITY_COLUMNS = (
+    City.city,
+    City.county,
+    City.state_code,
+    City.state_name,
+    ST_AsText(City.geo_location).label("geo_location"),
+)
 
-    return {"message": "Data is already loaded"}
+# Projected geometry column per /dmas/total_area region, plus a short TTL
+# cache since the endpoint's inputs are low-cardinality
+REGION_GEOM_COLUMNS = {
+    "europe": Dma.geom_3035,
+    "usa": Dma.geom_5070,
+    "india": Dma.geom_24376,
+}
+TOTAL_AREA_CACHE = TTLCache(maxsize=256, ttl=60)
+
+# Statements for the hot read endpoints, built once with bindparam() so the
+# compiled SQL (and asyncpg's prepared statement) is reused across requests
+NEARBY_DMAS_QUERY = select(*DMA_COLUMNS).where(
+    ST_DWithin(
+        Dma.geom_geog,
+        ST_GeogFromText(bindparam("point")),
+        bindparam("distance"),
+    )
+)
+# The && bbox prefilter hits the GiST index first; ST_Intersects then only
+# runs the exact test on the candidates
+_intersect_polygon = ST_GeomFromEWKB(bindparam("polygon_ewkb"))
+INTERSECTING_DMAS_QUERY = select(*DMA_COLUMNS).where(
+    Dma.geom.op("&&")(_intersect_polygon)
+    & ST_Intersects(Dma.geom, _intersect_polygon)
+)
+_knn_point = ST_SetSRID(
+    ST_MakePoint(bindparam("longitude"), bindparam("latitude")), 4326
+)
+_nearest_dma = (
+    select(Dma.geom).order_by(Dma.geom.op("<->")(_knn_point)).limit(1).subquery()
+)
+NEAREST_DMA_DISTANCE_QUERY = select(
+    ST_Distance(
+        _nearest_dma.c.geom,
+        _knn_point,
+        True,  # Use spherical geometry for distance calculation
+    )
+)
 
 
-@app.get("/load-dmas")
-async def load_dmas(db_session: AsyncSession = Depends(get_async_session)):
-    try:
-        if await is_dma_table_empty(db_session):
-            csv.field_size_limit(10000000)
-            dmas = []
-            with open("output.csv", "r") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=";")
-
-                # Skip the first row (header)
-                next(csv_reader)
-
-                for row in csv_reader:
-                    wkt_geom = None
-
-                    # Check if the geometry field is not empty
-                    if row[6]:
-                        polygon = loads(row[6])
-                        if (
-                            polygon.geom_type == "Polygon"
-                            or polygon.geom_type == "MultiPolygon"
-                        ):
-                            wkt_geom = polygon.wkt
-                        else:
-                            # Handle the case of unsupported geometry type
-                            print(
-                                f"Unsupported geometry type for DMA {row[2]}: {polygon.geom_type}"
-                            )
-                            continue  # Skip this row due to invalid geometry type
-
-                    dma = Dma(
-                        # dma_id=row[0],
-                        dma_key=row[1],
-                        dma_name=row[2],
-                        dma_long=row[3],
-                        region=row[4],
-                        zone=row[5],
-                        geom=wkt_geom,
-                        max_bug_coverage=float(row[7]) if row[7] else None,
-                        start_date=datetime.strptime(row[8], "%Y-%m-%d").date()
-                        if row[8]
-                        else None,
-                        end_date=datetime.strptime(row[9], "%Y-%m-%d").date()
-                        if row[9]
-                        else None,
-                        # geo_location=f"POINT({row[5]} {row[6]})",
-                    )
-                    dmas.append(dma)
-                db_session.add_all(dmas)
-                await db_session.commit()
-                return {"message": "Data loaded successfully"}
-    except Exception as e:
-        print(e)
-        return {"message": "An error occurred while loading data"}
-
-    return {"message": "Data is already loaded"}
-
-
-@app.get("/load-pipes")
-async def load_pipes(db_session: AsyncSession = Depends(get_async_session)):
-    try:
-        if await is_pipes_table_empty(db_session):
-            csv.field_size_limit(10000000)
-            pipes = []
-            with open("output_pipes.csv", "r") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=";")
-
-                # Skip the first row (header)
-                next(csv_reader)
-
-                for row in csv_reader:
-                    wkt_geom = None
-                    # Check if the geometry field is not empty
-                    if row[1]:
-                        line = loads(row[1])
-                        if (
-                            line.geom_type == "LineString"
-                            or line.geom_type == "MultiLineString"
-                        ):
-                            wkt_geom = line.wkt
-                        else:
-                            # Handle the case of unsupported geometry type
-                            print(
-                                f"Unsupported geometry type for Pipe {row[2]}: {line.geom_type}"
-                            )
-                            continue  # Skip this row due to invalid geometry type
-
-                    pipe = Pipe(
-                        # pipe_id=row[0],
-                        geom=wkt_geom,
-                        material=row[2],
-                        pipe_key=row[3],
-                        created_date=datetime.strptime(
-                            row[4], "%Y-%m-%d %H:%M:%S"
-                        ).date()
-                        if row[4]
-                        else None,
-                        diameter_mm=float(row[5]) if row[5] else None,
-                        pipe_type=row[6],
-                        pipe_subtype=row[7],
-                        standardised_material=row[8],
-                        dma_id=int(row[9]) if row[9] else None,
-                        company_id=int(row[10]) if row[10] else None,
-                    )
-                    pipes.append(pipe)
-                db_session.add_all(pipes)
-                await db_session.commit()
-                return {"message": "Data loaded successfully"}
-    except Exception as e:
-        print(e)
-        return {"message": "An error occurred while loading data"}
-    return {"message": "Data is already loaded"}
+@app.get("/")
+async def root():
+    return {"message": "Hello World"}
 
 
 @app.get("/dmas", response_model=list[DmaSchema])
@@ -209,7 +146,7 @@ async def get_dmas(
     """
     # This is where you would normally interact with your internal ORM or database to retrieve (and potentially filter) the records.
 
-    query = select(Dma).offset((page - 1) * per_page).limit(per_page)
+    query = select(*DMA_COLUMNS).offset((page - 1) * per_page).limit(per_page)
     if dma_key:
         query = query.where(Dma.dma_key == dma_key)
     if start_date:
@@ -217,7 +154,7 @@ async def get_dmas(
 
     result = await db_session.execute(query)
 
-    return result.scalars().all()
+    return adapter_response(DMA_LIST_ADAPTER, result.mappings().all())
 
 
 @app.get("/dmas/nearby", response_model=list[DmaSchema])
@@ -251,16 +188,12 @@ async def get_nearby_dmas(
     # Point WKT format
     point = f"SRID=4326;POINT({longitude} {latitude})"
 
-    # Query DMAs within the specified distance from the point
-    query = select(Dma).where(
-        ST_DWithin(
-            Dma.geom,  # Assuming your geometry column is named 'geom'
-            ST_GeogFromText(point),
-            distance,
-        )
+    # Query DMAs within the specified distance from the point; the generated
+    # geography column keeps the GiST index usable
+    result = await db_session.execute(
+        NEARBY_DMAS_QUERY, {"point": point, "distance": distance}
     )
-    result = await db_session.execute(query)
-    return result.scalars().all()
+    return adapter_response(DMA_LIST_ADAPTER, result.mappings().all())
 
 
 @app.get("/dmas/total_area")
@@ -272,19 +205,23 @@ async def get_total_area(
     dma_key: str = Query(description="The DMA key to filter by. (314-07)"),
     db_session: AsyncSession = Depends(get_async_session),
 ):
-    epsg_codes = {
-        "europe": 3035,
-        "usa": 5070,
-        "india": 24376,
-    }
-    if region not in epsg_codes:
+    if region not in REGION_GEOM_COLUMNS:
         raise HTTPException(status_code=400, detail="Invalid region")
-    query = select(ST_Area(ST_Transform(Dma.geom, epsg_codes[region])))
+
+    # (dma_key, region) is low-cardinality, so repeats are served from cache
+    cache_key = (dma_key, region)
+    if cache_key in TOTAL_AREA_CACHE:
+        return TOTAL_AREA_CACHE[cache_key]
+
+    # ST_Area runs on the persisted projected column, not a per-row transform
+    query = select(ST_Area(REGION_GEOM_COLUMNS[region]))
     if dma_key:
         query = query.where(Dma.dma_key == dma_key)
 
     result = await db_session.execute(query)
-    return {"value": result.scalar_one(), "unit": "m²"}
+    response = {"value": result.scalar_one(), "unit": "m²"}
+    TOTAL_AREA_CACHE[cache_key] = response
+    return response
 
 
 @app.get("/dmas/intersecting", response_model=list[DmaSchema])
@@ -293,15 +230,18 @@ async def get_dmas_intersecting_polygon(
     polygon_wkt: str = "-0.15429 51.52938, -0.14742 51.53050, -0.14691 51.52682, -0.15275 51.52618, -0.15429 51.52938",
     db_session: AsyncSession = Depends(get_async_session),
 ):
-    # Convert the WKT polygon to a PostGIS geometry
-    polygon = ST_GeomFromText(
-        f"POLYGON(({polygon_wkt}))", 4326
-    )  # SRID 4326 for GPS coordinates
-
-    query = select(Dma).where(ST_Intersects(Dma.geom, polygon))
+    # Validate the WKT once client-side and ship EWKB, so the server skips
+    # the text parse entirely
+    try:
+        polygon = shapely.from_wkt(f"POLYGON(({polygon_wkt}))")
+    except GEOSException:
+        raise HTTPException(status_code=400, detail="Invalid polygon WKT")
+    polygon_ewkb = shapely.to_wkb(shapely.set_srid(polygon, 4326), include_srid=True)
 
-    result = await db_session.execute(query)
-    return result.scalars().all()
+    result = await db_session.execute(
+        INTERSECTING_DMAS_QUERY, {"polygon_ewkb": polygon_ewkb}
+    )
+    return adapter_response(DMA_LIST_ADAPTER, result.mappings().all())
 
 
 @app.get("/dmas/nearest/distance", response_model=dict)
@@ -310,30 +250,21 @@ async def get_distance_to_nearest_dma(
     longitude: float = -0.16270,
     db_session: AsyncSession = Depends(get_async_session),
 ):
-    point = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)
-    query = (
-        select(
-            ST_Distance(
-                Dma.geom,
-                point,
-                True,  # Use spherical geometry for distance calculation
-            )
-        )
-        .order_by(ST_Distance(Dma.geom, point))
-        .limit(1)
+    # Find the nearest candidate with the index-assisted KNN operator <->,
+    # then compute the exact spherical distance on that single row
+    result = await db_session.execute(
+        NEAREST_DMA_DISTANCE_QUERY, {"longitude": longitude, "latitude": latitude}
     )
-
-    result = await db_session.execute(query)
     return {"value": result.scalar_one(), "units": "m"}
 
 
 @app.get("/cities", response_model=list[CitySchema])
 async def get_all_cities(db_session: AsyncSession = Depends(get_async_session)):
-    query = select(City)
+    query = select(*CITY_COLUMNS)
     result = await db_session.execute(query)
-    cities = result.scalars().all()
+    cities = result.mappings().all()
 
-    return cities
+    return adapter_response(CITY_LIST_ADAPTER, cities)
 
 
 @app.post("/nearby-cities-by-details")
@@ -341,11 +272,10 @@ async def get_nearby_cities_by_details(
     nearby_cities_schema: NearbyCitiesSchema,
     db_session: AsyncSession = Depends(get_async_session),
 ):
-    city, county, state_code, km_within = (
+    city, county, state_code = (
         nearby_cities_schema.city,
         nearby_cities_schema.county,
         nearby_cities_schema.state_code,
-        nearby_cities_schema.km_within,
     )
 
     # Check if the target city exists and retrieve its geography
@@ -367,7 +297,7 @@ async def get_nearby_cities_by_details(
 
     # Query nearby cities within the specified distance from the target city
     nearby_cities_query = select(City.city).where(
-        ST_DWithin(City.geo_location, target_geography, 1000 * km_within)
+        ST_DWithin(City.geo_location_geog, target_geography, nearby_cities_schema.meters)
     )
     result = await db_session.execute(nearby_cities_query)
     nearby_cities = result.scalars().all()
@@ -380,16 +310,13 @@ async def get_nearby_cities_by_coords(
     coords_schema: NearbyCitiesByCoordsSchema,
     db_session: AsyncSession = Depends(get_async_session),
 ):
-    lat, long, km_within = (
-        coords_schema.lat,
-        coords_schema.long,
-        coords_schema.km_within,
-    )
+    lat, long = coords_schema.lat, coords_schema.long
 
-    target_geography = ST_GeogFromText(f"POINT({lat} {long})", srid=4326)
+    # WKT points are (lon lat)
+    target_geography = ST_GeogFromText(f"SRID=4326;POINT({long} {lat})")
 
     nearby_cities_query = select(City.city).where(
-        ST_DWithin(City.geo_location, target_geography, 1000 * km_within)
+        ST_DWithin(City.geo_location_geog, target_geography, coords_schema.meters)
     )
     result = await db_session.execute(nearby_cities_query)
     nearby_cities = result.scalars().all()
@@ -402,9 +329,9 @@ async def get_cities_in_state(
     state_code: str = Path(..., min_length=2, max_length=2),
     db_session: AsyncSession = Depends(get_async_session),
 ):
-    query = select(City).where(City.state_code == state_code.upper())
+    query = select(*CITY_COLUMNS).where(City.state_code == state_code.upper())
     result = await db_session.execute(query)
-    cities = result.scalars().all()
+    cities = result.mappings().all()
 
     if not cities:
         raise HTTPException(
@@ -412,4 +339,4 @@ async def get_cities_in_state(
             detail=f"No cities found for provided state: {state_code}",
         )
 
-    return cities
+    return adapter_response(CITY_LIST_ADAPTER, cities)
@@ -1,7 +1,15 @@
 from datetime import date
 
-from geoalchemy2 import Geometry, WKBElement
-from sqlalchemy import Date, Float, ForeignKey, Integer, String, UniqueConstraint
+from geoalchemy2 import Geography, Geometry, WKBElement
+from sqlalchemy import (
+    Computed,
+    Date,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,6 +28,13 @@ class City(Base):
     geo_location: Mapped[WKBElement] = mapped_column(
         Geometry(geometry_type="POINT", srid=4326, spatial_index=True)
     )
+    # Generated geography twin of geo_location, so ST_DWithin can hit a GiST
+    # index directly instead of casting the geometry column per row
+    geo_location_geog: Mapped[WKBElement] = mapped_column(
+        Geography(geometry_type="POINT", srid=4326, spatial_index=True),
+        Computed("geo_location::geography", persisted=True),
+        nullable=True,
+    )
 
 
 class Dma(Base):
@@ -33,7 +48,30 @@ class Dma(Base):
     region: Mapped[str] = mapped_column(String(100), nullable=True)
     zone: Mapped[str] = mapped_column(String(100), nullable=True)
     geom: Mapped[WKBElement] = mapped_column(
-        Geometry(geometry_type="GEOMETRY", srid=4326), nullable=True
+        Geometry(geometry_type="GEOMETRY", srid=4326, spatial_index=True),
+        nullable=True,
+    )
+    geom_geog: Mapped[WKBElement] = mapped_column(
+        Geography(geometry_type="GEOMETRY", srid=4326, spatial_index=True),
+        Computed("geom::geography", persisted=True),
+        nullable=True,
+    )
+    # Persisted per-region projections, so area queries run on precomputed
+    # geometry instead of calling ST_Transform per row
+    geom_3035: Mapped[WKBElement] = mapped_column(
+        Geometry(geometry_type="GEOMETRY", srid=3035),
+        Computed("ST_Transform(geom, 3035)", persisted=True),
+        nullable=True,
+    )
+    geom_5070: Mapped[WKBElement] = mapped_column(
+        Geometry(geometry_type="GEOMETRY", srid=5070),
+        Computed("ST_Transform(geom, 5070)", persisted=True),
+        nullable=True,
+    )
+    geom_24376: Mapped[WKBElement] = mapped_column(
+        Geometry(geometry_type="GEOMETRY", srid=24376),
+        Computed("ST_Transform(geom, 24376)", persisted=True),
+        nullable=True,
     )
     max_bug_coverage: Mapped[float] = mapped_column(Float, nullable=True)
     start_date: Mapped[date] = mapped_column(Date, nullable=True)
@@ -49,7 +87,8 @@ class Pipe(Base):
     # Using explicit column types with additional parameters such as primary_key and autoincrement
     pipe_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     geom: Mapped[WKBElement] = mapped_column(
-        Geometry(geometry_type="GEOMETRY", srid=4326), nullable=True
+        Geometry(geometry_type="GEOMETRY", srid=4326, spatial_index=True),
+        nullable=True,
     )
     material: Mapped[str] = mapped_column(String(200), nullable=True)
     pipe_key: Mapped[str] = mapped_column(String(100), nullable=True)
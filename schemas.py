@@ -1,25 +1,54 @@
 from datetime import date
 from typing import Optional
 
-from geoalchemy2.shape import to_shape
-from pydantic import BaseModel, PositiveInt, field_validator
+import shapely
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    PositiveInt,
+    TypeAdapter,
+    computed_field,
+    field_validator,
+)
 from pydantic_extra_types.coordinate import Latitude, Longitude
 
 
+def wkb_to_wkt(value):
+    """
+    Fallback conversion for geometry values that still arrive as WKB.
+
+    The endpoints select geometry as text at the DB, so this only runs for
+    the odd caller handing a raw WKBElement or bytes to a schema.
+    """
+    return shapely.from_wkb(getattr(value, "data", value)).wkt
+
+
 class NearbyCitiesSchema(BaseModel):
     city: str
     county: str
     state_code: str
     km_within: PositiveInt
 
+    @computed_field
+    @property
+    def meters(self) -> int:
+        return 1000 * self.km_within
+
 
 class NearbyCitiesByCoordsSchema(BaseModel):
     lat: Latitude
     long: Longitude
     km_within: PositiveInt
 
+    @computed_field
+    @property
+    def meters(self) -> int:
+        return 1000 * self.km_within
+
 
 class CitySchema(BaseModel):
+    model_config = ConfigDict(defer_build=False, arbitrary_types_allowed=True)
+
     city: str
     county: str
     state_code: str
@@ -28,7 +57,11 @@ class CitySchema(BaseModel):
 
     @field_validator("geo_location", mode="before")
     def turn_geo_location_into_wkt(cls, value):
-        return to_shape(value).wkt
+        # Endpoints select geometry as text; only fall back to the per-row
+        # shapely path for raw WKB values
+        if isinstance(value, str):
+            return value
+        return wkb_to_wkt(value)
 
     # Define the DMA model (simplified version)
 
@@ -43,8 +76,10 @@ class DmaSchema(BaseModel):
     geom: Optional[str]
     start_date: Optional[date]
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=False,
+        arbitrary_types_allowed=True,
+        json_schema_extra={
             "example": {
                 "dma_id": 1,
                 "dma_key": "2300",
@@ -55,7 +90,8 @@ class DmaSchema(BaseModel):
                 "geom": "POLYGON((-70.6693 43.0722, -70.6693 43.0723, -70.6692 43.0723, -70.6692 43.0722, -70.6693 43.0722))",
                 "start_date": "2023-04-01",
             }
-        }
+        },
+    )
 
     # @classmethod
     # def from_orm(cls, obj):
@@ -67,8 +103,8 @@ class DmaSchema(BaseModel):
 
     @field_validator("geom", mode="before")
     def turn_geo_location_into_wkt(cls, value):
-        if value is not None:
-            return to_shape(value).wkt
+        if value is not None and not isinstance(value, str):
+            return wkb_to_wkt(value)
         return value
 
     # @validator("geom", pre=True, allow_reuse=True)
@@ -91,8 +127,10 @@ class PipeSchema(BaseModel):
     dma_id: Optional[int]
     company_id: Optional[int]
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=False,
+        arbitrary_types_allowed=True,
+        json_schema_extra={
             "example": {
                 "pipe_id": 1,
                 "geom": "LINESTRING(-70.6693 43.0722, -70.6693 43.0723)",
@@ -106,12 +144,13 @@ class PipeSchema(BaseModel):
                 "dma_id": 1,
                 "company_id": 1,
             }
-        }
+        },
+    )
 
     @field_validator("geom", mode="before")
     def turn_geo_location_into_wkt(cls, value):
-        if value is not None:
-            return to_shape(value).wkt
+        if value is not None and not isinstance(value, str):
+            return wkb_to_wkt(value)
         return value
 
     # @classmethod
@@ -127,3 +166,10 @@ class PipeSchema(BaseModel):
     #     if v is not None:
     #         return shape(json.loads(v)).wkt
     #     return v
+
+
+# Shared list adapters, built once so endpoints batch-validate and dump whole
+# responses instead of going through per-item validation on every request
+CITY_LIST_ADAPTER = TypeAdapter(list[CitySchema])
+DMA_LIST_ADAPTER = TypeAdapter(list[DmaSchema])
+PIPE_LIST_ADAPTER = TypeAdapter(list[PipeSchema])
@@ -1,36 +1,37 @@
-from sqlalchemy import exists, select
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from models import City, Dma, Pipe
-
-
-async def is_city_table_empty(db_session: AsyncSession):
-    """
-    Check if the city table is empty.
-    Parameters:
-    - db_session (AsyncSession): The database session.
-    Returns:
-    - bool: True if the city table is empty, False otherwise.
-    """
-
-    query = select(City.id.isnot(None))
-    query = select(exists(query))
-    result = await db_session.execute(query)
-    table_exists = result.scalars().one()
-    return not (table_exists)
-
-
-async def is_dma_table_empty(db_session: AsyncSession):
-    query = select(Dma.dma_id.isnot(None))
-    query = select(exists(query))
-    result = await db_session.execute(query)
-    table_exists = result.scalars().one()
-    return not (table_exists)
-
-
-async def is_pipes_table_empty(db_session: AsyncSession):
-    query = select(Pipe.pipe_id.isnot(None))
-    query = select(exists(query))
-    result = await db_session.execute(query)
-    table_exists = result.scalars().one()
-    return not (table_exists)
+from sqlalchemy import literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import City, Dma, Pipe
+
+# One SELECT 1 ... LIMIT 1 statement per model, built once so every call
+# reuses the same compiled form (the engine carries a shared compiled_cache)
+_EXISTS_QUERIES = {
+    model: select(literal(1)).select_from(model).limit(1)
+    for model in (City, Dma, Pipe)
+}
+
+
+async def _is_table_empty(db_session: AsyncSession, model):
+    """
+    Check if a model's table is empty.
+    Parameters:
+    - db_session (AsyncSession): The database session.
+    - model: The mapped model whose table to check.
+    Returns:
+    - bool: True if the table is empty, False otherwise.
+    """
+
+    result = await db_session.execute(_EXISTS_QUERIES[model])
+    return result.first() is None
+
+
+async def is_city_table_empty(db_session: AsyncSession):
+    return await _is_table_empty(db_session, City)
+
+
+async def is_dma_table_empty(db_session: AsyncSession):
+    return await _is_table_empty(db_session, Dma)
+
+
+async def is_pipes_table_empty(db_session: AsyncSession):
+    return await _is_table_empty(db_session, Pipe)